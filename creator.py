@@ -1,16 +1,76 @@
+import argparse
 import open3d as o3d
 import numpy as np
 import os
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    import cupoch as cph
+except ImportError:
+    cph = None
+
+def count_lines(file_path):
+    # Count newlines in 1 MB blocks; +1 covers a last line without a trailing newline
+    with open(file_path, 'rb') as f:
+        return sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b'')) + 1
+
+
+def read_xyz(file_path, cache=False, chunk_size=1_000_000):
+    # Parse in float32 with pandas' C tokenizer; np.loadtxt is only the fallback.
+    # With cache=True the parsed array is kept as a .npy sibling and memory-mapped
+    # on later loads so the text is only parsed once.
+    cache_path = file_path + ".npy"
+    if cache and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+        print(f"Using cached points from {cache_path}")
+        return np.load(cache_path, mmap_mode='r')
+    if pd is not None:
+        # Stream the file in chunks straight into one preallocated buffer, so peak
+        # memory is the final array plus a single chunk
+        points = np.empty((count_lines(file_path), 3), dtype=np.float32)
+        count = 0
+        for chunk in pd.read_csv(file_path, sep=r"\s+", header=None, usecols=[0, 1, 2],
+                                 dtype=np.float32, engine="c", chunksize=chunk_size):
+            points[count:count + len(chunk)] = chunk.to_numpy()
+            count += len(chunk)
+        points = points[:count]
+    else:
+        points = np.loadtxt(file_path, usecols=(0, 1, 2), dtype=np.float32)
+    if cache:
+        np.save(cache_path, points)
+    return points
+
+
+def points_to_point_cloud(points):
+    # Wrap the float32 buffer as a tensor point cloud without copying and let
+    # to_legacy() widen to float64 in C++, instead of materialising a float64
+    # copy in NumPy first. Older Open3D builds without the tensor API take the
+    # Vector3dVector path.
+    if not points.flags.writeable:
+        points = np.array(points)
+    try:
+        tpcd = o3d.t.geometry.PointCloud(o3d.core.Tensor.from_numpy(np.ascontiguousarray(points, dtype=np.float32)))
+        return tpcd.to_legacy()
+    except (AttributeError, TypeError):
+        pcd = o3d.geometry.PointCloud()
+        pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64, copy=False))
+        return pcd
+
 
-def load_point_cloud(file_path):
+def load_point_cloud(file_path, cache=False):
     print(f"Attempting to load file: {file_path}")
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File {file_path} does not exist!")
     if file_path.endswith('.xyz'):
-        point_cloud = np.loadtxt(file_path, delimiter=' ')
-        pcd = o3d.geometry.PointCloud()
-        pcd.points = o3d.utility.Vector3dVector(point_cloud)
+        pcd = points_to_point_cloud(read_xyz(file_path, cache=cache))
     elif file_path.endswith('.pcd'):
         pcd = o3d.io.read_point_cloud(file_path)
         if not pcd.has_points():
@@ -21,28 +81,83 @@ def load_point_cloud(file_path):
     return pcd
 
 
-def orient_normals(pcd):
-    pcd.estimate_normals(search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=0.1, max_nn=30))
-    pcd.orient_normals_consistent_tangent_plane(k=30)
+def orient_normals(pcd, strict=True, max_nn=16):
+    pcd.estimate_normals(search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=0.1, max_nn=max_nn))
+    if strict:
+        # MST over the kNN graph: handles any shape but is O(N k log N)
+        pcd.orient_normals_consistent_tangent_plane(k=30)
+    else:
+        # Star-shaped clouds (sphere, pyramid): point every normal away from the
+        # centroid in a single linear pass
+        pcd.orient_normals_towards_camera_location(camera_location=pcd.get_center())
+        pcd.normals = o3d.utility.Vector3dVector(-np.asarray(pcd.normals))
     print("Normals oriented.")
     return pcd
 
 
-def poisson_reconstruction(pcd, depth=8):
+def cupoch_to_numpy(vector):
+    # cupoch vectors live on the device; .cpu() copies them back to the host
+    return np.asarray(vector.cpu() if hasattr(vector, "cpu") else vector)
+
+
+def cupoch_poisson(pcd, depth):
+    cpcd = cph.geometry.PointCloud()
+    cpcd.points = cph.utility.Vector3fVector(np.asarray(pcd.points, dtype=np.float32))
+    cpcd.normals = cph.utility.Vector3fVector(np.asarray(pcd.normals, dtype=np.float32))
+    cmesh, densities = cph.geometry.TriangleMesh.create_from_point_cloud_poisson(cpcd, depth=depth)
+    mesh = o3d.geometry.TriangleMesh()
+    mesh.vertices = o3d.utility.Vector3dVector(cupoch_to_numpy(cmesh.vertices).astype(np.float64))
+    mesh.triangles = o3d.utility.Vector3iVector(cupoch_to_numpy(cmesh.triangles).astype(np.int32))
+    return mesh, cupoch_to_numpy(densities)
+
+
+def poisson_reconstruction(pcd, depth=8, width=0, scale=1.1, linear_fit=False, n_threads=-1,
+                           density_quantile=0.0, backend="auto"):
     print("Running Poisson reconstruction with depth=", depth)
-    mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(pcd, depth=depth)
+    if backend == "cupoch" and cph is None:
+        raise ImportError("cupoch is not installed")
+    mesh = None
+    if backend in ("auto", "cupoch") and cph is not None and pcd.has_normals():
+        try:
+            mesh, densities = cupoch_poisson(pcd, depth)
+            print("Poisson reconstruction ran on the GPU (cupoch)")
+        except AttributeError:
+            # cupoch build without Poisson support
+            if backend == "cupoch":
+                raise
+    if mesh is None:
+        try:
+            mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(
+                pcd, depth=depth, width=width, scale=scale, linear_fit=linear_fit, n_threads=n_threads)
+        except TypeError:
+            # Older Open3D builds do not accept n_threads
+            mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(
+                pcd, depth=depth, width=width, scale=scale, linear_fit=linear_fit)
+    if density_quantile > 0:
+        densities = np.asarray(densities)
+        mesh.remove_vertices_by_mask(densities < np.quantile(densities, density_quantile))
+        print(f"Trimmed vertices below the {density_quantile:.0%} density quantile")
     mesh.compute_vertex_normals()
-    colors = np.full((len(mesh.vertices), 3), [0.0, 0.0, 1.0])  # Blue
-    mesh.vertex_colors = o3d.utility.Vector3dVector(colors)
+    mesh.paint_uniform_color([0.0, 0.0, 1.0])  # Blue
     print(f"Poisson mesh has {len(mesh.triangles)} triangles")
     return mesh
 
 
-def ball_pivoting_reconstruction(pcd, radii=[1.0, 2.0, 4.0, 8.0, 16.0]):
-    distances = pcd.compute_nearest_neighbor_distance()
-    avg_dist = np.mean(distances)
+def nearest_neighbor_distances(pcd):
+    if cKDTree is not None:
+        # k=2 because each point's first neighbour is itself; queries run on all cores
+        points = np.asarray(pcd.points)
+        return cKDTree(points).query(points, k=2, workers=-1)[0][:, 1]
+    return np.asarray(pcd.compute_nearest_neighbor_distance())
+
+
+def ball_pivoting_reconstruction(pcd, radii=[1.0, 2.0, 4.0]):
+    distances = nearest_neighbor_distances(pcd)
+    avg_dist = float(np.mean(distances))
     print(f"Average nearest neighbor distance: {avg_dist}")
-    radii = [r * avg_dist for r in radii]  # Scale radii by avg distance
+    # Scale radii by avg distance; BPA pivots cheapest from small to large.
+    # Each radius is a full pivoting pass, so the default keeps three.
+    radii = np.sort(np.asarray(radii, dtype=np.float64)) * avg_dist
     print(f"Using radii: {radii}")
     mesh = o3d.geometry.TriangleMesh.create_from_point_cloud_ball_pivoting(pcd, o3d.utility.DoubleVector(radii))
     mesh.compute_vertex_normals()
@@ -50,6 +165,14 @@ def ball_pivoting_reconstruction(pcd, radii=[1.0, 2.0, 4.0, 8.0, 16.0]):
     return mesh
 
 
+def write_mesh(path, mesh):
+    # Binary PLY; the uniform Poisson paint carries no information, so colours
+    # and UVs are left out
+    o3d.io.write_triangle_mesh(path, mesh, write_ascii=False, compressed=True,
+                               write_vertex_normals=True, write_vertex_colors=False,
+                               write_triangle_uvs=False)
+
+
 def visualize_geometry(geometry, name="Geometry"):
     vis = o3d.visualization.Visualizer()
     vis.create_window(window_name=name)
@@ -69,35 +192,54 @@ def visualize_geometry(geometry, name="Geometry"):
 
 
 def main():
-    file_path = "/Users/srujanraj/Downloads/sphere.pcd"
+    parser = argparse.ArgumentParser(description="Reconstruct meshes from a point cloud file.")
+    parser.add_argument("file_path", nargs="?", default="/Users/srujanraj/Downloads/sphere.pcd",
+                        help="input .pcd or .xyz file")
+    parser.add_argument("--cache", action="store_true",
+                        help="keep parsed .xyz points in a .npy file next to the input and reuse it on later runs")
+    parser.add_argument("--visualize", action="store_true",
+                        help="open a viewer window after each stage")
+    parser.add_argument("--fast-normals", action="store_true",
+                        help="orient normals away from the centroid instead of with the tangent-plane MST "
+                             "(only correct for star-shaped clouds such as the sample sphere)")
+    args = parser.parse_args()
+
+    file_path = args.file_path
     print(f"Starting with file: {file_path}")
 
     try:
-        pcd = load_point_cloud(file_path)
+        pcd = load_point_cloud(file_path, cache=args.cache)
     except Exception as e:
         print(f"Error loading point cloud: {e}")
         return
 
-    print("Visualizing raw point cloud...")
-    visualize_geometry(pcd, "Raw Point Cloud")
+    if args.visualize:
+        print("Visualizing raw point cloud...")
+        visualize_geometry(pcd, "Raw Point Cloud")
 
-    pcd = orient_normals(pcd)
-    print("Visualizing point cloud with normals...")
-    visualize_geometry(pcd, "Point Cloud with Normals")
+    pcd = orient_normals(pcd, strict=not args.fast_normals)
+    if args.visualize:
+        print("Visualizing point cloud with normals...")
+        visualize_geometry(pcd, "Point Cloud with Normals")
 
-    poisson_mesh = poisson_reconstruction(pcd, depth=8)
+    # Each extra octree level costs ~8x, so scale depth with the cloud size
+    num_points = len(pcd.points)
+    depth = int(np.clip(np.log2(max(num_points, 1)) / 1.5, 6, 10))
+    poisson_mesh = poisson_reconstruction(pcd, depth=depth, width=0, scale=1.1)
     if poisson_mesh.has_triangles():
-        o3d.io.write_triangle_mesh("poisson_mesh.ply", poisson_mesh)
+        write_mesh("poisson_mesh.ply", poisson_mesh)
         print("Saved poisson_mesh.ply")
-        visualize_geometry(poisson_mesh, "Poisson Mesh")
+        if args.visualize:
+            visualize_geometry(poisson_mesh, "Poisson Mesh")
     else:
         print("Poisson reconstruction failed: no triangles generated.")
 
     ball_pivot_mesh = ball_pivoting_reconstruction(pcd)
     if ball_pivot_mesh.has_triangles():
-        o3d.io.write_triangle_mesh("ball_pivot_mesh.ply", ball_pivot_mesh)
+        write_mesh("ball_pivot_mesh.ply", ball_pivot_mesh)
         print("Saved ball_pivot_mesh.ply")
-        visualize_geometry(ball_pivot_mesh, "Ball Pivoting Mesh")
+        if args.visualize:
+            visualize_geometry(ball_pivot_mesh, "Ball Pivoting Mesh")
     else:
         print("Ball Pivoting reconstruction failed: no triangles generated.")
 
@@ -2,34 +2,139 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTabWidget,
-                           QTextEdit, QPushButton, QHBoxLayout, QWidget)
+                           QScrollArea, QPushButton, QHBoxLayout, QWidget)
 from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtGui import QPixmap, QFont, QDesktopServices
 
 
+ABOUT_HTML = """
+<p>Point Cloud Processor is an advanced application for processing and visualizing 3D point clouds.
+It provides tools for generating, manipulating, and visualizing point cloud data as well as
+performing surface reconstruction.</p>
+
+<p>Key features include:</p>
+<ul>
+    <li>Point cloud generation (sphere, pyramid)</li>
+    <li>Support for .pcd and .xyz file formats</li>
+    <li>Normal estimation and orientation</li>
+    <li>Poisson surface reconstruction</li>
+    <li>Ball pivoting surface reconstruction</li>
+    <li>Interactive 3D visualization</li>
+    <li>Mesh export capabilities</li>
+</ul>
+
+<p>This application uses Open3D and PyVista for processing and visualization.</p>
+"""
+
+CREATORS_HTML = """
+<h3>Team Members</h3>
+
+<p><b>John Doe</b> - Project Lead & Algorithm Developer</p>
+<p>Responsible for core algorithms implementation, point cloud processing pipeline,
+and overall architecture design.</p>
+
+<p><b>Jane Smith</b> - 3D Visualization Specialist</p>
+<p>Developed the interactive 3D visualization components and rendering optimizations.</p>
+
+<p><b>David Johnson</b> - UI/UX Designer</p>
+<p>Created the user interface design, application workflow, and user experience improvements.</p>
+
+<h3>Special Thanks</h3>
+<p>Special thanks to the Open3D and PyVista developer communities for their excellent libraries
+that made this application possible.</p>
+"""
+
+LIBRARIES_HTML = """
+<p>This application relies on the following open-source libraries:</p>
+
+<ul>
+    <li><b>PyQt5</b> - Cross-platform GUI framework</li>
+    <li><b>Open3D</b> - Library for 3D data processing</li>
+    <li><b>NumPy</b> - Scientific computing library</li>
+    <li><b>PyVista</b> - 3D visualization and mesh analysis toolkit</li>
+    <li><b>pyvistaqt</b> - PyQt integration for PyVista</li>
+</ul>
+
+<p>Each of these libraries is subject to its own license terms.</p>
+"""
+
+
 class AboutWidget(QDialog):
+    # Shared by every dialog instance; built on first use because QFont needs a QApplication
+    _TITLE_FONT = None
+    _CREDITS_FONT = None
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("About Point Cloud Processor")
         self.setMinimumSize(600, 400)
+        self._init_fonts()
         self.setup_ui()
 
+    @classmethod
+    def _init_fonts(cls):
+        if cls._TITLE_FONT is not None:
+            return
+
+        cls._TITLE_FONT = QFont()
+        cls._TITLE_FONT.setPointSize(16)
+        cls._TITLE_FONT.setBold(True)
+
+        cls._CREDITS_FONT = QFont()
+        cls._CREDITS_FONT.setPointSize(14)
+        cls._CREDITS_FONT.setBold(True)
+
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
 
-        # Create tabs
-        tabs = QTabWidget()
+        # Create tabs; only the About page is built up-front, the others are
+        # swapped in the first time they are shown
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.build_about_tab(), "About")
+        self.tabs.addTab(QWidget(), "Creators")
+        self.tabs.addTab(QWidget(), "Libraries")
+        self.tab_builders = {1: self.build_creators_tab, 2: self.build_libraries_tab}
+        self.tabs.currentChanged.connect(self.build_tab)
+
+        main_layout.addWidget(self.tabs)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+
+        website_button = QPushButton("Visit Website")
+        website_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://example.com")))
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+
+        button_layout.addWidget(website_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+
+        main_layout.addLayout(button_layout)
 
-        # Create About tab
+    def build_tab(self, index):
+        builder = self.tab_builders.pop(index, None)
+        if builder is None:
+            return
+
+        # Replace the placeholder without re-entering this slot
+        placeholder = self.tabs.widget(index)
+        name = self.tabs.tabText(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, builder(), name)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
+    def build_about_tab(self):
         about_widget = QWidget()
         about_layout = QVBoxLayout(about_widget)
 
         # Application title
         title_label = QLabel("Point Cloud Processor")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(self._TITLE_FONT)
         title_label.setAlignment(Qt.AlignCenter)
         about_layout.addWidget(title_label)
 
@@ -39,110 +144,52 @@ class AboutWidget(QDialog):
         about_layout.addWidget(version_label)
 
         # Description
-        desc_text = QTextEdit()
-        desc_text.setReadOnly(True)
-        desc_text.setHtml("""
-        <p>Point Cloud Processor is an advanced application for processing and visualizing 3D point clouds.
-        It provides tools for generating, manipulating, and visualizing point cloud data as well as
-        performing surface reconstruction.</p>
-
-        <p>Key features include:</p>
-        <ul>
-            <li>Point cloud generation (sphere, pyramid)</li>
-            <li>Support for .pcd and .xyz file formats</li>
-            <li>Normal estimation and orientation</li>
-            <li>Poisson surface reconstruction</li>
-            <li>Ball pivoting surface reconstruction</li>
-            <li>Interactive 3D visualization</li>
-            <li>Mesh export capabilities</li>
-        </ul>
-
-        <p>This application uses Open3D and PyVista for processing and visualization.</p>
-        """)
+        desc_text = self.rich_text_view(ABOUT_HTML)
         about_layout.addWidget(desc_text)
 
-        tabs.addTab(about_widget, "About")
+        return about_widget
 
-        # Create Creators tab
+    def build_creators_tab(self):
         creators_widget = QWidget()
         creators_layout = QVBoxLayout(creators_widget)
 
         # Credits title
         credits_label = QLabel("Development Team")
-        credits_font = QFont()
-        credits_font.setPointSize(14)
-        credits_font.setBold(True)
-        credits_label.setFont(credits_font)
+        credits_label.setFont(self._CREDITS_FONT)
         credits_label.setAlignment(Qt.AlignCenter)
         creators_layout.addWidget(credits_label)
 
         # Team members
-        team_text = QTextEdit()
-        team_text.setReadOnly(True)
-        team_text.setHtml("""
-        <h3>Team Members</h3>
-
-        <p><b>John Doe</b> - Project Lead & Algorithm Developer</p>
-        <p>Responsible for core algorithms implementation, point cloud processing pipeline,
-        and overall architecture design.</p>
-
-        <p><b>Jane Smith</b> - 3D Visualization Specialist</p>
-        <p>Developed the interactive 3D visualization components and rendering optimizations.</p>
-
-        <p><b>David Johnson</b> - UI/UX Designer</p>
-        <p>Created the user interface design, application workflow, and user experience improvements.</p>
-
-        <h3>Special Thanks</h3>
-        <p>Special thanks to the Open3D and PyVista developer communities for their excellent libraries
-        that made this application possible.</p>
-        """)
+        team_text = self.rich_text_view(CREATORS_HTML)
         creators_layout.addWidget(team_text)
 
-        tabs.addTab(creators_widget, "Creators")
+        return creators_widget
 
-        # Create Libraries tab
+    def build_libraries_tab(self):
         libs_widget = QWidget()
         libs_layout = QVBoxLayout(libs_widget)
 
         # Libraries title
         libs_label = QLabel("Libraries & Dependencies")
-        libs_label.setFont(credits_font)
+        libs_label.setFont(self._CREDITS_FONT)
         libs_label.setAlignment(Qt.AlignCenter)
         libs_layout.addWidget(libs_label)
 
         # Libraries list
-        libs_text = QTextEdit()
-        libs_text.setReadOnly(True)
-        libs_text.setHtml("""
-        <p>This application relies on the following open-source libraries:</p>
-
-        <ul>
-            <li><b>PyQt5</b> - Cross-platform GUI framework</li>
-            <li><b>Open3D</b> - Library for 3D data processing</li>
-            <li><b>NumPy</b> - Scientific computing library</li>
-            <li><b>PyVista</b> - 3D visualization and mesh analysis toolkit</li>
-            <li><b>pyvistaqt</b> - PyQt integration for PyVista</li>
-        </ul>
-
-        <p>Each of these libraries is subject to its own license terms.</p>
-        """)
+        libs_text = self.rich_text_view(LIBRARIES_HTML)
         libs_layout.addWidget(libs_text)
 
-        tabs.addTab(libs_widget, "Libraries")
+        return libs_widget
 
-        main_layout.addWidget(tabs)
+    def rich_text_view(self, html):
+        # Static read-only HTML: a QLabel avoids the QTextEdit document/editor machinery
+        label = QLabel(html)
+        label.setTextFormat(Qt.RichText)
+        label.setWordWrap(True)
+        label.setOpenExternalLinks(True)
+        label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
 
-        # Buttons
-        button_layout = QHBoxLayout()
-
-        website_button = QPushButton("Visit Website")
-        website_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://example.com")))
-
-        close_button = QPushButton("Close")
-        close_button.clicked.connect(self.accept)
-
-        button_layout.addWidget(website_button)
-        button_layout.addStretch()
-        button_layout.addWidget(close_button)
-
-        main_layout.addLayout(button_layout)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(label)
+        return scroll_area
@@ -9,7 +9,7 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                             QLabel, QPushButton, QComboBox, QCheckBox, QSlider, QFileDialog,
                             QTabWidget, QSpinBox, QDoubleSpinBox, QLineEdit, QGroupBox,
                             QSplitter, QMessageBox, QStatusBar, QFrame)
-from PyQt5.QtCore import Qt, QSettings
+from PyQt5.QtCore import Qt, QSettings, QThreadPool
 from PyQt5.QtGui import QIcon, QFont
 
 import open3d as o3d
@@ -17,16 +17,9 @@ import pyvista as pv
 from pyvistaqt import QtInteractor
 
 # Import other modules
-from utils import (
-    generate_sphere_point_cloud,
-    generate_tetrahedron_point_cloud,
-    load_point_cloud,
-    orient_normals,
-    poisson_reconstruction,
-    ball_pivoting_reconstruction,
-    o3d_to_pyvista
-)
+from utils import o3d_to_pyvista
 from about import AboutWidget
+from worker import ProcessWorker
 
 
 class MainWindow(QMainWindow):
@@ -42,6 +35,15 @@ class MainWindow(QMainWindow):
         self.point_cloud = None
         self.poisson_mesh = None
         self.ball_pivot_mesh = None
+        self.result = None
+
+        # PyVista copies of the Open3D geometries, keyed by id(geometry)
+        self.pv_cache = {}
+
+        # Visualization tabs whose plot is out of date, and the arguments to
+        # render them with; a tab is only drawn when it is shown
+        self.dirty_tabs = set()
+        self.tab_args = {}
 
         # Set up the main layout
         self.central_widget = QWidget()
@@ -283,6 +285,8 @@ class MainWindow(QMainWindow):
 
         self.visualization_tabs.addTab(self.ball_pivot_tab, "Ball Pivoting Reconstruction")
 
+        self.visualization_tabs.currentChanged.connect(self.render_tab)
+
         # Add tabs to visualization layout
         vis_layout.addWidget(self.visualization_tabs)
 
@@ -333,57 +337,59 @@ class MainWindow(QMainWindow):
             self.file_path_label.setToolTip(file_path)
 
     def process_point_cloud(self):
+        source = self.source_combo.currentText()
+        file_path = self.file_path_label.toolTip()
+        if source == "Upload File" and not file_path:
+            self.show_error("Please select a file first")
+            return
+
+        # Run the pipeline off the GUI thread so the window stays responsive
+        self.worker = ProcessWorker(
+            source,
+            num_points=self.points_spin.value(),
+            file_path=file_path,
+            normal_k=self.normal_k_spin.value() if self.normal_check.isChecked() else None,
+            poisson_depth=self.poisson_depth_spin.value() if self.poisson_check.isChecked() else None,
+            ball_radii_text=self.ball_radii_edit.text() if self.ball_pivot_check.isChecked() else None
+        )
+        self.worker.signals.finished.connect(self.on_processing_finished)
+        self.worker.signals.error.connect(self.on_processing_error)
+
+        self.process_button.setEnabled(False)
+        self.statusBar.showMessage("Processing...")
+        QThreadPool.globalInstance().start(self.worker)
+
+    def on_processing_finished(self, result):
         try:
-            self.statusBar.showMessage("Processing...")
-
-            # Get source type
-            source = self.source_combo.currentText()
-
-            # Generate or load point cloud
-            if source == "Generate Sphere":
-                num_points = self.points_spin.value()
-                self.point_cloud = generate_sphere_point_cloud(num_points=num_points)
-                self.show_info(f"Generated sphere with {len(self.point_cloud.points)} points")
-            elif source == "Generate Pyramid":
-                num_points = self.points_spin.value()
-                self.point_cloud = generate_tetrahedron_point_cloud(num_points=num_points)
-                self.show_info(f"Generated pyramid with {len(self.point_cloud.points)} points")
-            else:  # Upload File
-                file_path = self.file_path_label.toolTip()
-                if not file_path:
-                    self.show_error("Please select a file first")
-                    return
-
-                try:
-                    self.point_cloud = load_point_cloud(file_path)
-                    self.show_info(f"Loaded point cloud with {len(self.point_cloud.points)} points")
-                except Exception as e:
-                    self.show_error(f"Error loading file: {str(e)}")
-                    return
-
-            # Visualize input point cloud
-            self.visualize_input()
-
-            # Process normals if requested
-            if self.normal_check.isChecked():
-                normal_k = self.normal_k_spin.value()
-                self.point_cloud = orient_normals(self.point_cloud, k=normal_k)
-                self.visualize_normals(normal_k)
-
-            # Perform Poisson reconstruction if requested
-            if self.poisson_check.isChecked():
-                poisson_depth = self.poisson_depth_spin.value()
-                self.poisson_mesh = poisson_reconstruction(self.point_cloud, depth=poisson_depth)
-                self.visualize_poisson(poisson_depth)
-
-            # Perform Ball Pivoting reconstruction if requested
-            if self.ball_pivot_check.isChecked():
-                try:
-                    ball_radii = [float(r.strip()) for r in self.ball_radii_edit.text().split(",")]
-                    self.ball_pivot_mesh = ball_pivoting_reconstruction(self.point_cloud, radii=ball_radii)
-                    self.visualize_ball_pivot(ball_radii)
-                except Exception as e:
-                    self.show_error(f"Ball Pivoting failed: {str(e)}")
+            self.result = result
+            self.point_cloud = result.point_cloud
+            self.poisson_mesh = result.poisson_mesh
+            self.ball_pivot_mesh = result.ball_pivot_mesh
+            self.pv_cache.clear()
+            self.show_info(result.message)
+
+            # Mark the tabs produced by this run for rendering
+            self.tab_args = {0: ()}
+            if result.normal_k is not None:
+                self.tab_args[1] = (result.normal_k,)
+            if result.poisson_depth is not None:
+                self.tab_args[2] = (result.poisson_depth,)
+            if result.ball_pivot_error:
+                self.show_error(result.ball_pivot_error)
+            elif result.ball_radii is not None:
+                self.tab_args[3] = (result.ball_radii,)
+            self.dirty_tabs = set(self.tab_args)
+
+            # Clear tabs this run did not produce, so they don't keep showing
+            # the previous run's results
+            for index in range(1, 4):
+                if index not in self.tab_args:
+                    self.clear_tab(index)
+            if result.ball_pivot_error:
+                self.ball_pivot_info.setText(result.ball_pivot_error)
+
+            # Visualize input point cloud; this also switches to its tab
+            self.render_tab(0)
 
             # Enable save button if any processing was successful
             self.save_button.setEnabled(True)
@@ -393,12 +399,43 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.show_error(f"Processing error: {str(e)}")
 
+        finally:
+            self.process_button.setEnabled(True)
+
+    def on_processing_error(self, message):
+        self.show_error(message)
+        self.process_button.setEnabled(True)
+
+    def render_tab(self, index):
+        if index not in self.dirty_tabs:
+            return
+        # Clear the flag first: visualize_input re-selects its tab
+        self.dirty_tabs.discard(index)
+
+        renderers = [self.visualize_input, self.visualize_normals,
+                     self.visualize_poisson, self.visualize_ball_pivot]
+        try:
+            renderers[index](*self.tab_args[index])
+        except Exception as e:
+            self.show_error(f"Visualization error: {str(e)}")
+
+    def clear_tab(self, index):
+        plotters = [self.input_plotter, self.normals_plotter,
+                    self.poisson_plotter, self.ball_pivot_plotter]
+        plotters[index].clear()
+        infos = [(self.input_info, "No point cloud loaded"),
+                 (self.normals_info, "No normals estimated yet"),
+                 (self.poisson_info, "No Poisson reconstruction performed yet"),
+                 (self.ball_pivot_info, "No Ball Pivoting reconstruction performed yet")]
+        label, text = infos[index]
+        label.setText(text)
+
     def visualize_input(self):
         # Clear previous plot
         self.input_plotter.clear()
 
         # Convert to PyVista PolyData and add to plotter
-        pv_mesh = o3d_to_pyvista(self.point_cloud)
+        pv_mesh = self.to_pyvista(self.point_cloud)
         self.input_plotter.add_mesh(pv_mesh, point_size=5, render_points_as_spheres=True, color='lightblue')
 
         # Set view and background
@@ -407,9 +444,9 @@ class MainWindow(QMainWindow):
         self.input_plotter.reset_camera()
 
         # Update info
-        info_text = f"Number of points: {len(self.point_cloud.points)}\n"
-        info_text += f"Has normals: {'Yes' if self.point_cloud.has_normals() else 'No'}\n"
-        info_text += f"Has colors: {'Yes' if self.point_cloud.has_colors() else 'No'}"
+        info_text = f"Number of points: {self.result.num_points}\n"
+        info_text += f"Has normals: {'Yes' if self.result.has_normals else 'No'}\n"
+        info_text += f"Has colors: {'Yes' if self.result.has_colors else 'No'}"
         self.input_info.setText(info_text)
 
         # Switch to input tab
@@ -420,13 +457,18 @@ class MainWindow(QMainWindow):
         self.normals_plotter.clear()
 
         # Convert to PyVista PolyData and add to plotter
-        pv_mesh = o3d_to_pyvista(self.point_cloud)
+        pv_mesh = self.to_pyvista(self.point_cloud)
         self.normals_plotter.add_mesh(pv_mesh, point_size=5, render_points_as_spheres=True, color='lightblue')
 
-        # Add normals as arrows
-        if self.point_cloud.has_normals():
+        # Add normals as arrows, for a random subset of at most 2000 points;
+        # more arrows only cost rendering time without showing anything new
+        if "Normals" in pv_mesh.point_data:
+            idx = np.random.default_rng().choice(pv_mesh.n_points, size=min(2000, pv_mesh.n_points),
+                                                 replace=False)
+            arrows = pv.PolyData(pv_mesh.points[idx])
+            arrows.point_data["Normals"] = pv_mesh.point_data["Normals"][idx]
             self.normals_plotter.add_mesh(
-                pv_mesh.glyph(orient="Normals", scale=False, factor=0.05),
+                arrows.glyph(orient="Normals", scale=False, factor=0.05),
                 color='red'
             )
 
@@ -446,7 +488,7 @@ class MainWindow(QMainWindow):
 
         if self.poisson_mesh and self.poisson_mesh.has_triangles():
             # Convert to PyVista PolyData and add to plotter
-            pv_mesh = o3d_to_pyvista(self.poisson_mesh)
+            pv_mesh = self.to_pyvista(self.poisson_mesh)
             self.poisson_plotter.add_mesh(pv_mesh, color='lightblue', smooth_shading=True, show_edges=True)
 
             # Set view and background
@@ -467,7 +509,7 @@ class MainWindow(QMainWindow):
 
         if self.ball_pivot_mesh and self.ball_pivot_mesh.has_triangles():
             # Convert to PyVista PolyData and add to plotter
-            pv_mesh = o3d_to_pyvista(self.ball_pivot_mesh)
+            pv_mesh = self.to_pyvista(self.ball_pivot_mesh)
             self.ball_pivot_plotter.add_mesh(pv_mesh, color='lightblue', smooth_shading=True, show_edges=True)
 
             # Set view and background
@@ -482,6 +524,15 @@ class MainWindow(QMainWindow):
         else:
             self.ball_pivot_info.setText("Ball Pivoting reconstruction failed: no triangles generated")
 
+    def to_pyvista(self, geometry):
+        # Converting copies every point out of Open3D, so reuse the PyVista mesh
+        # until the geometry is replaced; holding the geometry keeps its id unique
+        cached = self.pv_cache.get(id(geometry))
+        if cached is None or cached[0] is not geometry:
+            cached = (geometry, o3d_to_pyvista(geometry))
+            self.pv_cache[id(geometry)] = cached
+        return cached[1]
+
     def save_results(self):
         if not self.point_cloud:
             self.show_error("No point cloud to save")
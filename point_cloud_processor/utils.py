@@ -6,60 +6,146 @@ import numpy as np
 import os
 import pyvista as pv
 
+# One generator for every random draw in this module. PCG64-DXSM is faster
+# than the legacy global Mersenne Twister behind np.random.uniform.
+_rng = np.random.Generator(np.random.PCG64DXSM())
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import cupoch as cph
+except ImportError:
+    cph = None
+
+
+def to_vector3d(points):
+    """Wrap an (N, 3) array for Open3D.
+
+    Vector3dVector only takes its fast bulk-copy path for C-contiguous float64
+    input, so convert once here rather than letting it fall back.
+    """
+    return o3d.utility.Vector3dVector(np.ascontiguousarray(points, dtype=np.float64))
+
 
 def generate_sphere_point_cloud(radius=1.0, num_points=10000):
     """Generate a point cloud representing a sphere."""
-    phi = np.random.uniform(0, 2 * np.pi, num_points)
-    theta = np.arccos(np.random.uniform(-1, 1, num_points))
-    x = radius * np.sin(theta) * np.cos(phi)
-    y = radius * np.sin(theta) * np.sin(phi)
-    z = radius * np.cos(theta)
-    points = np.stack((x, y, z), axis=1)
+    # Isotropic Gaussian samples normalised to the sphere are uniform on it,
+    # without any trigonometry
+    points = _rng.standard_normal((num_points, 3))
+    points *= radius / np.linalg.norm(points, axis=1, keepdims=True)
     pcd = o3d.geometry.PointCloud()
-    pcd.points = o3d.utility.Vector3dVector(points)
+    pcd.points = to_vector3d(points)
     return pcd
 
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def sample_triangles(triangles, uv, out):
+        """Map barycentric samples onto triangles in one fused pass.
+
+        Writes uv[f, i] reflected into triangle f to out[f * P + i], where P is
+        the number of samples per triangle, without NumPy temporaries.
+        """
+        points_per_face = uv.shape[1]
+        for f in range(triangles.shape[0]):
+            for i in prange(points_per_face):
+                u = uv[f, i, 0]
+                v = uv[f, i, 1]
+                if u + v > 1:
+                    u = 1 - u
+                    v = 1 - v
+                w = 1 - u - v
+                row = f * points_per_face + i
+                for k in range(3):
+                    out[row, k] = triangles[f, 0, k] * w + triangles[f, 1, k] * u + triangles[f, 2, k] * v
+
+
 def generate_tetrahedron_point_cloud(num_points=10000):
     """Generate a point cloud representing a pyramid (tetrahedron)."""
     vertices = np.array([
         [0, 0, 0], [1, 0, 0], [0, 1, 0], [0.5, 0.5, 1]
-    ])
-    faces = [[0, 1, 3], [1, 2, 3], [2, 0, 3], [0, 2, 1]]
-    points_per_face = num_points // 4
-    all_points = []
-
-    for face in faces:
-        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-        u = np.random.uniform(0, 1, points_per_face)
-        v = np.random.uniform(0, 1, points_per_face)
-        mask = u + v > 1
-        u[mask] = 1 - u[mask]
-        v[mask] = 1 - v[mask]
-        w = 1 - u - v
-        points = v0 * w[:, np.newaxis] + v1 * u[:, np.newaxis] + v2 * v[:, np.newaxis]
-        all_points.append(points)
-
-    points = np.vstack(all_points)
-    if len(points) > num_points:
-        points = points[:num_points]
-    elif len(points) < num_points:
-        extra = num_points - len(points)
-        points = np.vstack([points, points[:extra]])
+    ], dtype=np.float64)
+    faces = np.array([[0, 1, 3], [1, 2, 3], [2, 0, 3], [0, 2, 1]])
+    triangles = vertices[faces]  # (4 faces, 3 corners, xyz)
+    points_per_face = -(-num_points // 4)
+
+    # Barycentric (u, v) for every sample; pairs outside the triangle
+    # (u + v > 1) are reflected back inside
+    uv = _rng.random((4, points_per_face, 2), dtype=np.float32)
+    if njit is not None:
+        points = np.empty((4 * points_per_face, 3))
+        sample_triangles(triangles, uv, points)
+    else:
+        outside = uv.sum(axis=-1) > 1
+        uv[outside] = 1 - uv[outside]
+        bary = np.concatenate([1 - uv.sum(axis=-1, keepdims=True), uv], axis=-1)
+        points = np.einsum('fpb,fbk->fpk', bary, triangles).reshape(-1, 3)
+    points = points[:num_points]
 
     pcd = o3d.geometry.PointCloud()
-    pcd.points = o3d.utility.Vector3dVector(points)
+    pcd.points = to_vector3d(points)
     return pcd
 
 
+def read_xyz(file_path):
+    """Read the x, y, z columns of a space-separated .xyz file as float32.
+
+    Uses pyarrow's multi-threaded CSV reader or pandas' C tokenizer when
+    installed, and falls back to np.loadtxt. The values are parsed straight
+    to float32 and stay that way until to_vector3d widens them once for
+    Open3D.
+    """
+    if pacsv is not None:
+        columns = ["f0", "f1", "f2"]  # pyarrow's autogenerated names
+        try:
+            # Empty fields are not treated as nulls, so a run of spaces fails
+            # to parse instead of shifting values into the wrong column
+            table = pacsv.read_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+                parse_options=pacsv.ParseOptions(delimiter=' '),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.float32() for name in columns},
+                    include_columns=columns, null_values=[]))
+        except pa.ArrowException:
+            # pyarrow only splits on single spaces; tabs and runs of spaces
+            # need the whitespace-splitting readers below
+            table = None
+        if table is not None:
+            return np.column_stack([table.column(name).to_numpy() for name in columns])
+    if pd is not None:
+        return pd.read_csv(file_path, sep=r"\s+", header=None, usecols=[0, 1, 2],
+                           dtype=np.float32, engine="c").to_numpy()
+    return np.loadtxt(file_path, usecols=(0, 1, 2), dtype=np.float32)
+
+
 def load_point_cloud(file_path):
     """Load point cloud from file."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File {file_path} does not exist!")
     if file_path.endswith('.xyz'):
-        point_cloud = np.loadtxt(file_path, delimiter=' ')
+        point_cloud = read_xyz(file_path)
         pcd = o3d.geometry.PointCloud()
-        pcd.points = o3d.utility.Vector3dVector(point_cloud)
+        pcd.points = to_vector3d(point_cloud)
     elif file_path.endswith('.pcd'):
         pcd = o3d.io.read_point_cloud(file_path)
         if not pcd.has_points():
@@ -69,50 +155,185 @@ def load_point_cloud(file_path):
     return pcd
 
 
-def orient_normals(pcd, k=30):
-    """Estimate and orient normals."""
-    pcd.estimate_normals(search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=0.1, max_nn=k))
-    pcd.orient_normals_consistent_tangent_plane(k=k)
+def estimate_normals(pcd, k=30, radius=0.1):
+    """Estimate normals, on the GPU through the tensor API when CUDA is available.
+
+    Either way the normals are set on pcd itself, which is returned; the GPU
+    copy is only used for the estimate, so the points keep their precision.
+    """
+    if (hasattr(o3d, "t") and hasattr(o3d.t.geometry.PointCloud, "estimate_normals")
+            and o3d.core.cuda.is_available()):
+        tpcd = o3d.t.geometry.PointCloud.from_legacy(pcd, device=o3d.core.Device("CUDA:0"))
+        tpcd.estimate_normals(max_nn=k, radius=radius)
+        pcd.normals = to_vector3d(tpcd.point.normals.cpu().numpy())
+        return pcd
+    pcd.estimate_normals(search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=radius, max_nn=k))
     return pcd
 
 
-def poisson_reconstruction(pcd, depth=8):
-    """Perform Poisson surface reconstruction."""
-    mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(pcd, depth=depth)
+def orient_normals(pcd, k=30, strict=True):
+    """Estimate and orient normals.
+
+    With strict=False the normals are pointed away from the centroid in a
+    single linear pass instead of propagating orientation over a kNN spanning
+    tree; this is only correct for star-shaped clouds such as the generated
+    sphere and pyramid.
+    """
+    pcd = estimate_normals(pcd, k=k)
+    if strict:
+        pcd.orient_normals_consistent_tangent_plane(k=k)
+    else:
+        pcd.orient_normals_towards_camera_location(camera_location=pcd.get_center())
+        pcd.normals = o3d.utility.Vector3dVector(-np.asarray(pcd.normals))
+    return pcd
+
+
+def build_kdtree(pcd):
+    """Build a KD-tree that the reconstruction functions can share.
+
+    Returns None without SciPy, where estimate_average_spacing uses Open3D's
+    own query and needs no tree.
+    """
+    if cKDTree is None:
+        return None
+    return cKDTree(np.asarray(pcd.points))
+
+
+def estimate_average_spacing(pcd, tree=None, sample_size=5000):
+    """Estimate the mean nearest-neighbour distance of a point cloud.
+
+    With SciPy, up to sample_size random points are queried in one
+    multi-core call against a cKDTree over the full cloud; the mean spacing
+    is stable enough that the sample matches a query over every point. Pass
+    a build_kdtree() result as tree to share one build between several calls
+    on the same cloud. Without SciPy, Open3D's parallel C++ query over every
+    point is used, which beats looping over KDTreeFlann searches in Python.
+    """
+    points = np.asarray(pcd.points)
+    if len(points) < 2:
+        return 0.0
+    if cKDTree is None:
+        return float(np.mean(pcd.compute_nearest_neighbor_distance()))
+    if tree is None:
+        tree = cKDTree(points)
+    if len(points) > sample_size:
+        points = points[_rng.choice(len(points), sample_size, replace=False)]
+    # The first of the two neighbours is the query point itself
+    distances = tree.query(points, k=2, workers=-1)[0][:, 1]
+    return float(np.mean(distances))
+
+
+def cupoch_to_numpy(vector):
+    """Copy a cupoch device vector back to a NumPy array."""
+    return np.asarray(vector.cpu() if hasattr(vector, "cpu") else vector)
+
+
+def cupoch_poisson(pcd, depth):
+    """Run Poisson reconstruction on the GPU with cupoch.
+
+    Returns an Open3D mesh and the per-vertex densities, like the Open3D call.
+    """
+    cpcd = cph.geometry.PointCloud()
+    cpcd.points = cph.utility.Vector3fVector(np.asarray(pcd.points, dtype=np.float32))
+    cpcd.normals = cph.utility.Vector3fVector(np.asarray(pcd.normals, dtype=np.float32))
+    cmesh, densities = cph.geometry.TriangleMesh.create_from_point_cloud_poisson(cpcd, depth=depth)
+    mesh = o3d.geometry.TriangleMesh()
+    mesh.vertices = to_vector3d(cupoch_to_numpy(cmesh.vertices))
+    mesh.triangles = o3d.utility.Vector3iVector(cupoch_to_numpy(cmesh.triangles).astype(np.int32))
+    return mesh, cupoch_to_numpy(densities)
+
+
+def poisson_reconstruction(pcd, depth=8, voxel_factor=1.5, density_quantile=0.0, tree=None,
+                           backend="auto", cap_min_points=100_000):
+    """Perform Poisson surface reconstruction.
+
+    Clouds of more than cap_min_points points are first voxel-downsampled to
+    voxel_factor times their mean point spacing, and have depth capped at
+    log2(bounding-box diagonal / spacing), the finest octree level the
+    samples can actually support. Both bound the solver's memory on densely
+    sampled input; smaller clouds are cheap at any depth, so they are
+    reconstructed from every point at the requested depth. Vertices below
+    the density_quantile of the solver's
+    density estimate are trimmed when it is non-zero. tree is an optional
+    build_kdtree() result for pcd.
+
+    backend="auto" solves on the GPU through cupoch when it is installed and
+    the cloud has normals, falling back to Open3D; "cupoch" and "open3d"
+    force one or the other.
+
+    Returns the mesh and the depth actually used.
+    """
+    if backend == "cupoch" and cph is None:
+        raise ImportError("cupoch is not installed")
+    if len(pcd.points) > cap_min_points:
+        spacing = max(estimate_average_spacing(pcd, tree=tree), 1e-6)
+        if voxel_factor > 0:
+            pcd = pcd.voxel_down_sample(spacing * voxel_factor)
+            if pcd.has_normals():
+                pcd.normalize_normals()
+        diagonal = np.linalg.norm(pcd.get_max_bound() - pcd.get_min_bound())
+        depth = min(depth, max(1, int(np.log2(diagonal / spacing))))
+
+    mesh = None
+    if backend in ("auto", "cupoch") and cph is not None and pcd.has_normals():
+        try:
+            mesh, densities = cupoch_poisson(pcd, depth)
+        except AttributeError:
+            # cupoch build without Poisson support
+            if backend == "cupoch":
+                raise
+    if mesh is None:
+        try:
+            mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(
+                pcd, depth=depth, n_threads=-1)
+        except TypeError:
+            # Older Open3D builds do not accept n_threads
+            mesh, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(pcd, depth=depth)
+    if density_quantile > 0:
+        densities = np.asarray(densities)
+        mesh.remove_vertices_by_mask(densities < np.quantile(densities, density_quantile))
     mesh.compute_vertex_normals()
-    return mesh
+    return mesh, depth
 
 
-def ball_pivoting_reconstruction(pcd, radii=[1.0, 2.0, 4.0, 8.0, 16.0]):
-    """Perform Ball Pivoting surface reconstruction."""
-    distances = pcd.compute_nearest_neighbor_distance()
-    avg_dist = np.mean(distances)
-    radii = [r * avg_dist for r in radii]
+def ball_pivoting_reconstruction(pcd, radii=[1.0, 2.0, 4.0, 8.0, 16.0], tree=None):
+    """Perform Ball Pivoting surface reconstruction.
+
+    tree is an optional build_kdtree() result for pcd.
+    """
+    avg_dist = estimate_average_spacing(pcd, tree=tree)
+    # Copy before scaling in place so the caller's radii are left untouched
+    radii = np.array(radii, dtype=np.float64)
+    radii *= avg_dist
     mesh = o3d.geometry.TriangleMesh.create_from_point_cloud_ball_pivoting(pcd, o3d.utility.DoubleVector(radii))
     mesh.compute_vertex_normals()
     return mesh
 
 
 def o3d_to_pyvista(o3d_mesh):
-    """Convert Open3D mesh to PyVista mesh for visualization."""
+    """Convert Open3D mesh to PyVista mesh for visualization.
+
+    Coordinates and normals are converted to float32, which is all rendering
+    needs and halves what VTK uploads to the GPU.
+    """
     if isinstance(o3d_mesh, o3d.geometry.PointCloud):
-        vertices = np.asarray(o3d_mesh.points)
+        vertices = np.asarray(o3d_mesh.points, dtype=np.float32)
         mesh = pv.PolyData(vertices)
         if o3d_mesh.has_normals():
-            mesh.point_data["Normals"] = np.asarray(o3d_mesh.normals)
+            mesh.point_data["Normals"] = np.asarray(o3d_mesh.normals, dtype=np.float32)
         if o3d_mesh.has_colors():
             colors = np.asarray(o3d_mesh.colors)
             if colors.shape[1] == 3:  # RGB format
                 mesh.point_data["Colors"] = colors * 255
     else:
-        vertices = np.asarray(o3d_mesh.vertices)
+        vertices = np.asarray(o3d_mesh.vertices, dtype=np.float32)
         faces = np.asarray(o3d_mesh.triangles)
-        # Add triangle count to faces array for PyVista format
-        faces_pv = np.zeros((len(faces), 4), dtype=np.int64)
-        faces_pv[:, 0] = 3  # Triangle count (always 3 for triangles)
-        faces_pv[:, 1:4] = faces
-        faces_pv = faces_pv.flatten()
+        # PyVista's flat cell format: [3, a, b, c, 3, d, e, f, ...], written
+        # straight into one buffer
+        faces_pv = np.empty(faces.size + len(faces), dtype=np.int64)
+        faces_pv[0::4] = 3  # Triangle count (always 3 for triangles)
+        faces_pv.reshape(-1, 4)[:, 1:] = faces
         mesh = pv.PolyData(vertices, faces_pv)
         if o3d_mesh.has_vertex_normals():
-            mesh.point_data["Normals"] = np.asarray(o3d_mesh.vertex_normals)
+            mesh.point_data["Normals"] = np.asarray(o3d_mesh.vertex_normals, dtype=np.float32)
     return mesh
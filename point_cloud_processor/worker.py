@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+from utils import (
+    generate_sphere_point_cloud,
+    generate_tetrahedron_point_cloud,
+    load_point_cloud,
+    orient_normals,
+    poisson_reconstruction,
+    ball_pivoting_reconstruction,
+    build_kdtree
+)
+
+
+@dataclass
+class ProcessingResult:
+    """Output of one pipeline run.
+
+    num_points, has_normals and has_colors describe the input as loaded or
+    generated, before normal estimation, and are read from Open3D once so
+    the GUI can show them without querying the geometry again. A step that
+    did not run leaves its fields as None.
+    """
+    point_cloud: object
+    message: str
+    num_points: int = 0
+    has_normals: bool = False
+    has_colors: bool = False
+    normal_k: Optional[int] = None
+    poisson_depth: Optional[int] = None
+    poisson_mesh: object = None
+    ball_radii: Optional[List[float]] = None
+    ball_pivot_mesh: object = None
+    ball_pivot_error: Optional[str] = None
+
+
+class WorkerSignals(QObject):
+    # QRunnable is not a QObject, so its signals live here
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class ProcessWorker(QRunnable):
+    """Run the point cloud pipeline on a QThreadPool thread.
+
+    Widgets may only be touched from the GUI thread, so the worker takes plain
+    parameters and hands its results back through WorkerSignals. A step whose
+    parameter is None is skipped.
+    """
+
+    def __init__(self, source, num_points=10000, file_path=None, normal_k=None,
+                 poisson_depth=None, ball_radii_text=None):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.source = source
+        self.num_points = num_points
+        self.file_path = file_path
+        self.normal_k = normal_k
+        self.poisson_depth = poisson_depth
+        self.ball_radii_text = ball_radii_text
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.process()
+        except Exception as e:
+            self.signals.error.emit(f"Processing error: {str(e)}")
+            return
+        if result is not None:
+            self.signals.finished.emit(result)
+
+    def process(self):
+        # Generate or load point cloud
+        if self.source == "Generate Sphere":
+            point_cloud = generate_sphere_point_cloud(num_points=self.num_points)
+            message = f"Generated sphere with {len(point_cloud.points)} points"
+        elif self.source == "Generate Pyramid":
+            point_cloud = generate_tetrahedron_point_cloud(num_points=self.num_points)
+            message = f"Generated pyramid with {len(point_cloud.points)} points"
+        else:  # Upload File
+            try:
+                point_cloud = load_point_cloud(self.file_path)
+            except Exception as e:
+                self.signals.error.emit(f"Error loading file: {str(e)}")
+                return None
+            message = f"Loaded point cloud with {len(point_cloud.points)} points"
+
+        # Describe the input before normal estimation changes it
+        num_points = len(point_cloud.points)
+        has_normals = point_cloud.has_normals()
+        has_colors = point_cloud.has_colors()
+
+        # Process normals if requested
+        if self.normal_k is not None:
+            # Generated shapes are star-shaped, so the linear-time orientation is exact
+            point_cloud = orient_normals(point_cloud, k=self.normal_k,
+                                         strict=(self.source == "Upload File"))
+        result = ProcessingResult(
+            point_cloud=point_cloud,
+            message=message,
+            num_points=num_points,
+            has_normals=has_normals,
+            has_colors=has_colors,
+            normal_k=self.normal_k,
+            poisson_depth=self.poisson_depth
+        )
+
+        # Both reconstructions measure the point spacing; build their KD-tree once
+        tree = None
+        if self.poisson_depth is not None and self.ball_radii_text is not None:
+            tree = build_kdtree(point_cloud)
+
+        # Perform Poisson reconstruction if requested
+        if self.poisson_depth is not None:
+            # The depth may be capped for dense clouds; report the one used
+            result.poisson_mesh, result.poisson_depth = poisson_reconstruction(
+                point_cloud, depth=self.poisson_depth, tree=tree)
+
+        # Perform Ball Pivoting reconstruction if requested
+        if self.ball_radii_text is not None:
+            try:
+                ball_radii = np.fromstring(self.ball_radii_text, sep=",")
+                # fromstring stops at the first bad entry instead of raising
+                if ball_radii.size != self.ball_radii_text.count(",") + 1:
+                    raise ValueError(f"could not parse radii '{self.ball_radii_text}'")
+                result.ball_pivot_mesh = ball_pivoting_reconstruction(point_cloud, radii=ball_radii,
+                                                                         tree=tree)
+                result.ball_radii = ball_radii.tolist()
+            except Exception as e:
+                result.ball_pivot_error = f"Ball Pivoting failed: {str(e)}"
+
+        return result
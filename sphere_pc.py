@@ -1,35 +1,257 @@
+import argparse
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import open3d as o3d
+import open3d.core as o3c
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def fill_sphere(u, radius, out):
+        """Map uniform (phi, z) samples onto the sphere in one fused pass.
+
+        Each row's sin and cos are taken together, with no phi, z or r_xy
+        temporaries.
+        """
+        for i in prange(u.shape[0]):
+            phi = u[i, 0] * (2 * math.pi)
+            z = u[i, 1] * 2 - 1
+            r_xy = radius * math.sqrt(1 - z * z)
+            out[i, 0] = r_xy * math.cos(phi)
+            out[i, 1] = r_xy * math.sin(phi)
+            out[i, 2] = radius * z
+
+
+def fill_sphere_numpy(u, radius, out):
+    """NumPy fallback for fill_sphere, writing through out= ufuncs."""
+    # z = cos(theta) uniform in [-1, 1] gives a uniform sphere without
+    # computing theta itself. Only phi and r_xy get their own buffers; every
+    # other step runs in place
+    phi = np.multiply(u[:, 0], 2 * np.pi)  # Azimuthal angle
+    z_unit = np.multiply(u[:, 1], 2, out=out[:, 2])  # cos of the polar angle
+    z_unit -= 1
+    r_xy = np.multiply(z_unit, z_unit)  # sin of the polar angle
+    np.subtract(1, r_xy, out=r_xy)
+    np.sqrt(r_xy, out=r_xy)
+
+    # Convert spherical to Cartesian coordinates, writing straight into the
+    # columns of the output array
+    r_xy *= radius
+    np.cos(phi, out=out[:, 0])
+    out[:, 0] *= r_xy
+    np.sin(phi, out=out[:, 1])
+    out[:, 1] *= r_xy
+    z_unit *= radius
+
+
+@lru_cache(maxsize=8)
+def unit_fibonacci_sphere(num_points, dtype):
+    """Evenly spread unit-sphere points on a golden-angle (Fibonacci) spiral.
+
+    The layout depends only on num_points and dtype, so it is cached; the
+    returned array is read-only. The spiral is always computed in float64
+    and only the finished points are cast to dtype: in float32, i * golden
+    angle loses the azimuth's fractional turns once i reaches the millions.
+    """
+    i = np.arange(num_points, dtype=np.float64)
+    z_unit = 1 - (2 * i + 1) / num_points  # Equal-area bands, poles excluded
+    r_xy = np.sqrt(1 - z_unit * z_unit)
+    phi = i * (np.pi * (3 - math.sqrt(5)))  # Golden angle per step
+
+    points = np.empty((num_points, 3), dtype=np.float64)
+    np.cos(phi, out=points[:, 0])
+    points[:, 0] *= r_xy
+    np.sin(phi, out=points[:, 1])
+    points[:, 1] *= r_xy
+    points[:, 2] = z_unit
+    points = points.astype(dtype, copy=False)
+    points.setflags(write=False)
+    return points
+
+
+# Noise buffers reused across calls, one per dtype, grown to the largest cloud
+# seen. Shared module state: do not generate noisy spheres from several
+# threads at once.
+_noise_scratch = {}
+
+
+def noise_scratch(num_points, dtype):
+    """Return a reusable (num_points, 3) scratch array of the given dtype."""
+    buf = _noise_scratch.get(dtype)
+    if buf is None or len(buf) < num_points:
+        buf = _noise_scratch[dtype] = np.empty((num_points, 3), dtype=dtype)
+    return buf[:num_points]
+
+
+def seed_sequence(seed):
+    """Return a SeedSequence for seed that is safe to spawn from.
+
+    A SeedSequence passed in is copied rather than used directly, because
+    spawn() advances it; the caller's object is left untouched, so passing
+    it again reproduces the same cloud.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key,
+                                      pool_size=seed.pool_size)
+    return np.random.SeedSequence(seed)
 
-def generate_sphere_point_cloud(radius=1.0, num_points=10000):
-    """Generate a point cloud representing a sphere."""
-    # Generate random spherical coordinates
-    phi = np.random.uniform(0, 2 * np.pi, num_points)  # Azimuthal angle
-    theta = np.arccos(np.random.uniform(-1, 1, num_points))  # Polar angle
 
-    # Convert spherical to Cartesian coordinates
-    x = radius * np.sin(theta) * np.cos(phi)
-    y = radius * np.sin(theta) * np.sin(phi)
-    z = radius * np.cos(theta)
+def sphere_points(radius=1.0, num_points=10000, seed=None, noise_sigma=0.0, dtype=np.float64,
+                  n_workers=1, fibonacci=False):
+    """Return the (num_points, 3) positions behind generate_sphere_point_cloud.
 
-    # Create point cloud
-    points = np.stack((x, y, z), axis=1)
-    pcd = o3d.geometry.PointCloud()
-    pcd.points = o3d.utility.Vector3dVector(points)
+    Takes the same arguments; the array is C-contiguous in the given dtype.
+    """
+    seed_seq = seed_sequence(seed)
+    rng = np.random.default_rng(seed_seq)
+
+    if fibonacci:
+        # Scaling makes a fresh array, so the cached one is never modified
+        points = unit_fibonacci_sphere(num_points, np.dtype(dtype)) * radius
+    else:
+        # Uniform samples for both spherical angles, one row per point
+        u = np.empty((num_points, 2), dtype=dtype)
+        points = np.empty((num_points, 3), dtype=dtype)
+        if n_workers > 1:
+            bounds = np.linspace(0, num_points, n_workers + 1).astype(int)
+
+            def fill_block(child, lo, hi):
+                # Generator.random and the NumPy ufuncs release the GIL while they run
+                np.random.default_rng(child).random(out=u[lo:hi], dtype=dtype)
+                if njit is None:
+                    fill_sphere_numpy(u[lo:hi], radius, points[lo:hi])
+
+            with ThreadPoolExecutor(n_workers) as pool:
+                list(pool.map(fill_block, seed_seq.spawn(n_workers), bounds[:-1], bounds[1:]))
+        else:
+            rng.random(out=u, dtype=dtype)
+            if njit is None:
+                fill_sphere_numpy(u, radius, points)
+
+        # The Numba kernel is already parallel, and its default threading layer
+        # must not be entered from several threads at once, so it runs once here
+        if njit is not None:
+            fill_sphere(u, radius, points)
 
     # Optional: Add some noise to simulate real data
-    noise = np.random.normal(0, 0.0, points.shape)  # Small noise
-    pcd.points = o3d.utility.Vector3dVector(points + noise)
+    if noise_sigma > 0:
+        noise = noise_scratch(len(points), points.dtype)
+        rng.standard_normal(out=noise, dtype=points.dtype)
+        noise *= noise_sigma
+        points += noise
+
+    # Tensor.from_numpy and the raw PCD writer both need a C-contiguous buffer
+    points = np.ascontiguousarray(points)
+    assert points.flags['C_CONTIGUOUS'] and points.dtype in (np.float32, np.float64)
+    return points
+
+
+def generate_sphere_point_cloud(radius=1.0, num_points=10000, seed=None, noise_sigma=0.0, dtype=np.float64,
+                                n_workers=1, fibonacci=False):
+    """Generate a point cloud representing a sphere.
+
+    seed may be an int or a np.random.SeedSequence. With n_workers > 1 the
+    rows are split into blocks generated on a thread pool, each from its own
+    child of the seed's SeedSequence, so the streams never overlap; the
+    result is reproducible for a given seed and n_workers. noise_sigma is
+    the standard deviation of Gaussian noise added to every coordinate
+    (none by default). dtype=np.float32 does the sampling math in single
+    precision and keeps the positions in float32.
+
+    fibonacci=True places the points on a deterministic golden-angle spiral
+    instead of sampling them; n_workers is then ignored and seed only
+    drives the noise.
+
+    Returns an o3d.t.geometry.PointCloud whose positions share memory with
+    the generated array; call to_legacy() where a legacy PointCloud is needed.
+    """
+    points = sphere_points(radius, num_points, seed, noise_sigma, dtype, n_workers, fibonacci)
+
+    # Create point cloud; the tensor API wraps the array instead of copying it
+    pcd = o3d.t.geometry.PointCloud()
+    pcd.point["positions"] = o3c.Tensor.from_numpy(points)
 
     return pcd
 
 
-# Generate and save the sphere
-pcd = generate_sphere_point_cloud(radius=1.0, num_points=10000)
-output_path = "/Users/srujanraj/Downloads/sphere.pcd"
-o3d.io.write_point_cloud(output_path, pcd)
-print(f"Saved sphere point cloud with {len(pcd.points)} points to {output_path}")
+def write_sphere_pcd(output_path, radius=1.0, num_points=10000, seed=None, noise_sigma=0.0,
+                     dtype=np.float64, chunk_size=1_000_000):
+    """Stream a random sphere straight to a binary .pcd file.
+
+    Points are generated and written chunk_size at a time, so peak memory is
+    one chunk rather than the whole cloud plus Open3D's copy of it. Each
+    chunk draws from its own child of the seed's SeedSequence, so the file
+    is reproducible for a given seed and chunk_size but does not match
+    generate_sphere_point_cloud for the same seed.
+    """
+    dtype = np.dtype(dtype)
+    seed_seq = seed_sequence(seed)
+    starts = range(0, num_points, chunk_size)
+
+    # Binary PCD data is the raw little-endian x, y, z rows after the header
+    header = (
+        "# .PCD v0.7 - Point Cloud Data file format\n"
+        "VERSION 0.7\n"
+        "FIELDS x y z\n"
+        f"SIZE {dtype.itemsize} {dtype.itemsize} {dtype.itemsize}\n"
+        "TYPE F F F\n"
+        "COUNT 1 1 1\n"
+        f"WIDTH {num_points}\n"
+        "HEIGHT 1\n"
+        "VIEWPOINT 0 0 0 1 0 0 0\n"
+        f"POINTS {num_points}\n"
+        "DATA binary\n"
+    )
+    with open(output_path, "wb") as f:
+        f.write(header.encode("ascii"))
+        for start, child in zip(starts, seed_seq.spawn(len(starts))):
+            chunk = sphere_points(radius, min(chunk_size, num_points - start), child,
+                                  noise_sigma, dtype)
+            f.write(chunk.astype(dtype.newbyteorder("<"), copy=False).tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a sphere point cloud and save it as .pcd.")
+    parser.add_argument("--output", default="/Users/srujanraj/Downloads/sphere.pcd",
+                        help="output .pcd file")
+    parser.add_argument("--num-points", type=int, default=10000,
+                        help="number of points to generate")
+    parser.add_argument("--radius", type=float, default=1.0,
+                        help="sphere radius")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for a reproducible cloud")
+    parser.add_argument("--sigma", type=float, default=0.0,
+                        help="standard deviation of Gaussian noise added to each coordinate")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="stream the file this many points at a time instead of building the whole cloud")
+    parser.add_argument("--visualize", action="store_true",
+                        help="open a viewer window after saving")
+    args = parser.parse_args()
+
+    # Generate and save the sphere
+    if args.chunk_size > 0:
+        write_sphere_pcd(args.output, radius=args.radius, num_points=args.num_points,
+                         seed=args.seed, noise_sigma=args.sigma, chunk_size=args.chunk_size)
+        pcd = None
+    else:
+        pcd = generate_sphere_point_cloud(radius=args.radius, num_points=args.num_points,
+                                          seed=args.seed, noise_sigma=args.sigma)
+        o3d.t.io.write_point_cloud(args.output, pcd, write_ascii=False, compressed=True)
+    print(f"Saved sphere point cloud with {args.num_points} points to {args.output}")
+
+    # Optional: Visualize to confirm
+    if args.visualize:
+        legacy = pcd.to_legacy() if pcd is not None else o3d.io.read_point_cloud(args.output)
+        o3d.visualization.draw_geometries([legacy], window_name="Sphere Point Cloud")
+
 
-# Optional: Visualize to confirm
-o3d.visualization.draw_geometries([pcd], window_name="Sphere Point Cloud")
\ No newline at end of file
+if __name__ == "__main__":
+    main()